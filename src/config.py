@@ -1,11 +1,68 @@
 import os
+from functools import lru_cache
 
+import boto3
+from botocore.config import Config
 from dotenv import load_dotenv
 
-load_dotenv()
+# Avoid re-reading the .env file in every subprocess that imports config.
+if not os.environ.get("_ENV_LOADED"):
+    load_dotenv()
+    os.environ["_ENV_LOADED"] = "1"
 
 ENDPOINT_URL = "http://localhost:4566"
 REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID", "")
 REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET", "")
 REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT", "")
 BUCKET_NAME = os.getenv("BUCKET_NAME", "")
+
+
+@lru_cache(maxsize=None)
+def get_boto3_session() -> boto3.session.Session:
+    """Return the process-wide boto3 session."""
+    return boto3.session.Session()
+
+
+@lru_cache(maxsize=None)
+def get_s3_client(endpoint_url: str = ENDPOINT_URL):
+    """Return a cached S3 client built from the shared session.
+
+    The pool is sized for the concurrent tag lookups in list_all_keys
+    so its worker threads never block on connection checkout.
+    """
+    return get_boto3_session().client(
+        "s3",
+        endpoint_url=endpoint_url,
+        aws_access_key_id="dummy",
+        aws_secret_access_key="dummy",
+        region_name="us-east-1",
+        config=Config(
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            retries={"mode": "adaptive", "max_attempts": 10},
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_iam_client(endpoint_url: str = ENDPOINT_URL):
+    """Return a cached IAM client built from the shared session."""
+    return get_boto3_session().client(
+        "iam",
+        endpoint_url=endpoint_url,
+        aws_access_key_id="dummy",
+        aws_secret_access_key="dummy",
+        region_name="us-east-1",
+    )
+
+
+@lru_cache(maxsize=None)
+def get_redshift_client(endpoint_url: str = ENDPOINT_URL):
+    """Return a cached redshift client built from the shared session."""
+    return get_boto3_session().client(
+        "redshift",
+        endpoint_url=endpoint_url,
+        aws_access_key_id="dummy",
+        aws_secret_access_key="dummy",
+        region_name="us-east-1",
+    )
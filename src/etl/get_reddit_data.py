@@ -1,15 +1,36 @@
+import csv
+import gzip
+import io
 import logging
 import os
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, TextIO
 
-import pandas as pd
+import requests
 from praw import Reddit
+from requests.adapters import HTTPAdapter, Retry
 
-logging.basicConfig(level=logging.INFO)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pa_compute
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; fall back to the csv.writer path
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+POST_FIELDS = ("title", "id", "subreddit", "score", "num_comments", "url", "created")
 
 
 def connect_to_reddit(client_id: str, client_secret: str, user_agent: str) -> Reddit:
     """Connect to Reddit API using PRAW
+
+    PRAW is handed an explicit requests.Session whose adapter keeps
+    TCP+TLS connections alive across calls (every request hits the same
+    endpoint) and retries transient/throttling errors with backoff.
     args:
         client_id: str: client id of the Reddit API
         client_secret: str: client secret of the Reddit API
@@ -17,67 +38,195 @@ def connect_to_reddit(client_id: str, client_secret: str, user_agent: str) -> Re
     return: praw.Reddit: Reddit object
     """
     try:
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=5,
+                    backoff_factor=0.2,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                ),
+            ),
+        )
+        session.headers["Accept-Encoding"] = "gzip,deflate"
         reddit = Reddit(
-            client_id=client_id, client_secret=client_secret, user_agent=user_agent
+            client_id=client_id,
+            client_secret=client_secret,
+            user_agent=user_agent,
+            requestor_kwargs={"session": session},
         )
-        logging.info("Connected to Reddit !")
+        logger.info("Connected to Reddit !")
     except Exception as e:
-        logging.error(f"An error occurred: {e}")
+        logger.error(f"An error occurred: {e}")
         raise e
     return reddit
 
 
 def extract_data(
     reddit: Reddit, subreddits: list[str], limit: int = 20, time_filter: str = "week"
-) -> list:
-    """Get data from multiple subreddits and return as a list of posts
+) -> dict[str, list]:
+    """Get data from multiple subreddits and return it as columns of posts
+
+    Subreddits are fetched concurrently since the work is network-bound.
+    PRAW is not thread-safe (token refresh and rate-limiter state are
+    shared), so each worker thread talks through its own Reddit instance
+    built from the same credentials as the one passed in.
+    Posts are collected column-wise (one list per field) so the DataFrame
+    can be built directly from columns, without per-row dict overhead.
     args:
         reddit: praw.Reddit: Reddit object
         subreddits: list[str]: list of subreddit names
         limit: int: number of posts to fetch from each subreddit
         time_filter: str: time filter for top posts
-    return: list: list of posts
+    return: dict[str, list]: one list per post field, see POST_FIELDS
     """
-    all_posts = []
+
+    thread_local = threading.local()
+
+    def thread_reddit() -> Reddit:
+        if not hasattr(thread_local, "reddit"):
+            thread_local.reddit = connect_to_reddit(
+                reddit.config.client_id,
+                reddit.config.client_secret,
+                reddit.config.user_agent,
+            )
+        return thread_local.reddit
+
+    def fetch_subreddit(subreddit: str) -> dict[str, list]:
+        cols: dict[str, list] = {field: [] for field in POST_FIELDS}
+        for post in (
+            thread_reddit()
+            .subreddit(subreddit)
+            .top(time_filter=time_filter, limit=limit)
+        ):
+            cols["title"].append(post.title)
+            cols["id"].append(post.id)
+            cols["subreddit"].append(subreddit)
+            cols["score"].append(post.score)
+            cols["num_comments"].append(post.num_comments)
+            cols["url"].append(post.url)
+            cols["created"].append(int(post.created))
+        logger.info(f"Successfully fetched {len(cols['id'])} posts from {subreddit}")
+        return cols
+
+    all_posts: dict[str, list] = {field: [] for field in POST_FIELDS}
+    if not subreddits:
+        return all_posts
     try:
-        for subreddit in subreddits:
-            posts = []
-            for post in reddit.subreddit(subreddit).top(
-                time_filter=time_filter, limit=limit
-            ):
-                posts.append(
-                    {
-                        "title": post.title,
-                        "id": post.id,
-                        "subreddit": str(post.subreddit),
-                        "score": post.score,
-                        "num_comments": post.num_comments,
-                        "url": post.url,
-                        "created": post.created,
-                    }
-                )
-            all_posts.extend(posts)
-            logging.info(f"Successfully fetched {len(posts)} posts from {subreddit}")
+        with ThreadPoolExecutor(max_workers=min(len(subreddits), 8)) as executor:
+            for cols in executor.map(fetch_subreddit, subreddits):
+                for field in POST_FIELDS:
+                    all_posts[field].extend(cols[field])
     except Exception as e:
-        logging.error(f"An error occurred while fetching data from subreddits: {e}")
+        logger.error(f"An error occurred while fetching data from subreddits: {e}")
         raise e
     return all_posts
 
 
-def transform_load_data(posts: list, file_folder: str) -> None:
-    """Transform list of posts into a pandas DataFrame
+def format_created(created: float) -> str:
+    """Format a post's epoch timestamp the way pandas writes timestamps
     args:
-        posts: list: list of posts
-    return: pandas.DataFrame: DataFrame of posts
+        created: float: epoch timestamp in seconds
+    return: str: naive UTC timestamp, e.g. "2024-01-01 12:00:00"
+    """
+    return datetime.fromtimestamp(created, tz=timezone.utc).strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+
+
+def write_posts_csv(posts: dict[str, list], fileobj: TextIO) -> None:
+    """Write the post columns as CSV rows to an open text file object
+    args:
+        posts: dict[str, list]: one list per post field, see POST_FIELDS
+        fileobj: TextIO: writable text file object (opened with newline="")
+    """
+    writer = csv.writer(fileobj)
+    writer.writerow(POST_FIELDS)
+    writer.writerows(
+        zip(
+            posts["title"],
+            posts["id"],
+            posts["subreddit"],
+            posts["score"],
+            posts["num_comments"],
+            posts["url"],
+            (format_created(created) for created in posts["created"]),
+        )
+    )
+
+
+@contextmanager
+def _open_csv_gz(file_path: str):
+    """Open a .csv.gz file for writing with a 1MiB buffer and fast gzip
+
+    The large buffer keeps the write() syscall count low and
+    compresslevel=1 keeps the compressor from becoming the bottleneck.
+    args:
+        file_path: str: path of the .csv.gz file to write
+    """
+    with open(file_path, "wb", buffering=1 << 20) as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=1) as gz:
+            with io.TextIOWrapper(gz, encoding="utf-8", newline="") as text:
+                yield text
+
+
+def _write_posts_csv_arrow(posts: dict[str, list], file_path: str) -> None:
+    """Write the post columns as gzipped CSV through pyarrow's C writer
+    args:
+        posts: dict[str, list]: one list per post field, see POST_FIELDS
+        file_path: str: path of the .csv.gz file to write
+    """
+    columns: dict[str, Any] = {field: posts[field] for field in POST_FIELDS}
+    columns["created"] = pa_compute.strftime(
+        pa.array(posts["created"], type=pa.timestamp("s")),
+        format="%Y-%m-%d %H:%M:%S",
+    )
+    table = pa.Table.from_pydict(columns)
+    with pa.output_stream(file_path, compression="gzip") as sink:
+        pa_csv.write_csv(table, sink)
+
+
+def transform_load_data(
+    posts: dict[str, list], file_folder: str, use_pandas: bool = False
+) -> None:
+    """Transform the post columns and write them to a local CSV file
+
+    By default the CSV is written column-wise by pyarrow's vectorized C
+    writer when pyarrow is installed, and with csv.writer straight from
+    the column lists otherwise; both skip the DataFrame round-trip, and
+    pandas' generic to_csv machinery is noticeably slower for this
+    fixed schema. The file is gzipped: it cuts S3 bandwidth 5-10x for
+    this text-heavy data and Redshift COPY reads gzip natively.
+    args:
+        posts: dict[str, list]: one list per post field, see POST_FIELDS
+        file_folder: str: folder to write the CSV file into
+        use_pandas: bool: write through a pandas DataFrame instead
     """
     try:
         os.makedirs(file_folder, exist_ok=True)
-        df = pd.DataFrame(posts)
-        df["created"] = pd.to_datetime(df["created"], unit="s")
         current_date = datetime.now().strftime("%Y-%m-%d")
-        file_path = file_folder + f"{current_date}.csv"
-        df.to_csv(file_path, index=False)
-        logging.info("Successfully transformed and loaded data locally")
+        file_path = file_folder + f"{current_date}.csv.gz"
+        if use_pandas:
+            # imported lazily: the default S3+Redshift path never needs
+            # pandas, so the hot path skips its import cost entirely
+            import numpy as np
+            import pandas as pd
+
+            df = pd.DataFrame(posts, copy=False)
+            df["created"] = pd.to_datetime(
+                np.asarray(posts["created"], dtype="int64"), unit="s"
+            )
+            with _open_csv_gz(file_path) as f:
+                df.to_csv(f, index=False)
+        elif pa is not None:
+            _write_posts_csv_arrow(posts, file_path)
+        else:
+            with _open_csv_gz(file_path) as f:
+                write_posts_csv(posts, f)
+        logger.info("Successfully transformed and loaded data locally")
     except Exception as e:
-        logging.error(f"An error occurred while transforming/loading data: {e}")
+        logger.error(f"An error occurred while transforming/loading data: {e}")
         raise e
@@ -1,15 +1,22 @@
+import json
+from datetime import datetime
+
 from src.config import BUCKET_NAME
-from src.utils.RedshiftManager import RedshiftManager
-from src.utils.S3Manager import S3Manager
+from src.utils.RedshiftManager import get_redshift_manager
+from src.utils.S3Manager import get_s3_manager
 
 
 def load_data_to_redshift(arn: str) -> None:
     """Load data from S3 to Redshift
+
+    All pending files are loaded with a single manifest-based COPY
+    instead of one COPY per file, so the planner and commit overhead is
+    paid once regardless of how many files are pending.
     args:
-        file_path: str: path to the file to upload
+        arn: str: ARN of the IAM role used by the COPY command
     """
-    s3_manager = S3Manager(bucket_name=BUCKET_NAME)
-    with RedshiftManager() as redshift:
+    s3_manager = get_s3_manager(bucket_name=BUCKET_NAME)
+    with get_redshift_manager() as redshift:
         query_create_table = """ CREATE TABLE IF NOT EXISTS posts (
             title VARCHAR,
             id VARCHAR,
@@ -21,8 +28,24 @@ def load_data_to_redshift(arn: str) -> None:
             );"""
         redshift.execute_query(query=query_create_table)
 
-        paths = s3_manager.list_all_keys(status_filter="not loaded")
+        paths = s3_manager.list_all_keys(status_filter="not_loaded")
+        if not paths:
+            return
+
+        manifest = {"entries": [{"url": path, "mandatory": True} for path in paths]}
+        manifest_key = (
+            "manifests/" + datetime.now().strftime("%Y-%m-%d-%H%M%S") + ".manifest"
+        )
+        s3_manager.upload_bytes_to_s3(
+            data=json.dumps(manifest).encode(), s3_key=manifest_key
+        )
 
-        for path in paths:
-            redshift.copy_from_s3(table_name="posts", s3_path=path, iam_role=arn)
-            s3_manager.tag_s3_object(s3_key=path)
+        redshift.copy_from_s3(
+            table_name="posts",
+            s3_path=f"s3://{BUCKET_NAME}/{manifest_key}",
+            iam_role=arn,
+            gzip=True,
+            manifest=True,
+        )
+        keys = [path.split(f"{BUCKET_NAME}/", 1)[1] for path in paths]
+        s3_manager.mark_keys_loaded(keys + [manifest_key])
@@ -1,24 +1,68 @@
+import gzip
+import io
 import logging
 import os
 from datetime import datetime
 
-from src.config import BUCKET_NAME
+from src.etl.get_reddit_data import write_posts_csv
 from src.utils.S3Manager import S3Manager
 
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 
-def upload_and_cleanup(file_path: str) -> None:
+def stream_posts_to_s3(
+    posts: dict[str, list], s3_manager: S3Manager, s3_key: str = ""
+) -> None:
+    """Write the posts as gzipped CSV straight to S3, skipping local disk
+
+    The CSV is built inside an in-memory gzip buffer and handed to
+    upload_fileobj, so the data is never written to (and re-read from)
+    the local filesystem.
+    args:
+        posts: dict[str, list]: one list per post field, see POST_FIELDS
+        s3_manager: S3Manager: shared manager for the target bucket
+        s3_key: str: key to upload to; defaults to a date-based key
+    """
+    try:
+        if not s3_key:
+            now = datetime.now()
+            s3_key = now.strftime("%y/%m/%d") + now.strftime("/%Y-%m-%d.csv.gz")
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=1) as gz:
+            with io.TextIOWrapper(gz, encoding="utf-8", newline="") as text:
+                write_posts_csv(posts, text)
+        buffer.seek(0)
+        s3_manager.upload_fileobj_to_s3(
+            fileobj=buffer, s3_key=s3_key, extra_args={"ContentEncoding": "gzip"}
+        )
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        raise e
+
+
+def upload_and_cleanup(
+    file_path: str, s3_manager: S3Manager, s3_prefix: str = ""
+) -> None:
     """Upload the file to S3 and remove the local file
+
+    The S3 key keeps the local file name, so uploading several files
+    under the same prefix never silently overwrites earlier ones.
     args:
         file_path: str: path to the file to upload
+        s3_manager: S3Manager: shared manager for the target bucket
+        s3_prefix: str: key prefix, e.g. "24/01/01/"; computed from the
+            current date when empty
     """
     try:
-        s3_manager = S3Manager(bucket_name=BUCKET_NAME)
-        s3_key = datetime.now().strftime("%y/%m/%d") + "/data.csv"
-        s3_manager.upload_file_to_s3(local_file_path=file_path, s3_key=s3_key)
+        if not s3_prefix:
+            s3_prefix = datetime.now().strftime("%y/%m/%d") + "/"
+        s3_key = s3_prefix + os.path.basename(file_path)
+        extra_args = {"ContentEncoding": "gzip"} if file_path.endswith(".gz") else None
+        s3_manager.upload_file_to_s3(
+            local_file_path=file_path, s3_key=s3_key, extra_args=extra_args
+        )
         os.remove(file_path)
 
     except Exception as e:
-        logging.error(f"An error occurred: {e}")
+        logger.error(f"An error occurred: {e}")
         raise e
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
-import glob
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
 
 from src.config import (
     BUCKET_NAME,
@@ -10,23 +12,25 @@ from src.config import (
     REDDIT_CLIENT_SECRET,
     REDDIT_USER_AGENT,
 )
-from src.etl.get_reddit_data import connect_to_reddit, extract_data, transform_load_data
+from src.etl.get_reddit_data import connect_to_reddit, extract_data
 
 # from src.etl.load_data_to_redshift import load_data_to_redshift
-from src.etl.upload_data_to_s3 import upload_and_cleanup
-from src.utils.IAMManager import IAMManager
-from src.utils.RedshiftManager import RedshiftManager
-from src.utils.S3Manager import S3Manager
+from src.etl.upload_data_to_s3 import stream_posts_to_s3, upload_and_cleanup
+from src.utils.IAMManager import get_iam_manager
+from src.utils.RedshiftManager import get_redshift_manager
+from src.utils.S3Manager import get_s3_manager
 
 DATA_FOLDER = "src/etl/data/"
 
+logger = logging.getLogger(__name__)
+
 
 def setup_iam() -> str:
     """Setup IAM roles and policies
     return:
         str: The ARN of the created role.
     """
-    iam_manager = IAMManager()
+    iam_manager = get_iam_manager()
     with open("src/iam_config.json", "r") as f:
         iam_config = json.load(f)
 
@@ -34,10 +38,10 @@ def setup_iam() -> str:
 
     response = iam_manager.get_role_arn(role_name=role_name)
     if response:
-        logging.info(f"Role '{role_name}' already exists.")
+        logger.info(f"Role '{role_name}' already exists.")
         return response
 
-    logging.info("Creating IAM role and policy...")
+    logger.info("Creating IAM role and policy...")
 
     role_arn = iam_manager.create_role(
         role_name=iam_config["roles"][0]["role_name"],
@@ -50,7 +54,7 @@ def setup_iam() -> str:
         description=iam_config["policies"][0]["description"],
     )
     iam_manager.attach_policy_to_role(iam_config["roles"][0]["role_name"], policy_arn)
-    logging.info("IAM setup completed.")
+    logger.info("IAM setup completed.")
     return role_arn
 
 
@@ -59,14 +63,14 @@ def setup_infrastructure():
     try:
         if not os.path.exists(DATA_FOLDER):
             os.makedirs(DATA_FOLDER)
-        s3_manager = S3Manager(bucket_name=BUCKET_NAME)
-        s3_manager.create_bucket_if_not_exist()
-        redshift = RedshiftManager()
+        s3_manager = get_s3_manager(bucket_name=BUCKET_NAME)
+        s3_manager.ensure_bucket()
+        redshift = get_redshift_manager()
         redshift.create_cluster_if_not_exist()
     except Exception as e:
-        logging.error(f"An error occurred: {e}")
+        logger.error(f"An error occurred: {e}")
         raise e
-    logging.info("Infrastructure setup completed.")
+    logger.info("Infrastructure setup completed.")
 
 
 def main() -> None:
@@ -76,16 +80,29 @@ def main() -> None:
     )
     subreddits = ["dataengineering", "datascience"]
     posts = extract_data(reddit=reddit, subreddits=subreddits)
-    transform_load_data(posts=posts, file_folder=DATA_FOLDER)
-    files = glob.glob(DATA_FOLDER + "*")
-    for file in files:
-        upload_and_cleanup(file_path=file)
+    s3_manager = get_s3_manager(bucket_name=BUCKET_NAME)
+    stream_posts_to_s3(posts=posts, s3_manager=s3_manager)
+    # upload any files left behind by previous file-based runs
+    with os.scandir(DATA_FOLDER) as entries:
+        files = [entry.path for entry in entries if entry.is_file()]
+    s3_prefix = datetime.now().strftime("%y/%m/%d") + "/"
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(
+            executor.map(
+                partial(upload_and_cleanup, s3_manager=s3_manager, s3_prefix=s3_prefix),
+                files,
+            )
+        )
     arn = setup_iam()
-    logging.info(arn)
+    logger.info(arn)
     # load_data_to_redshift(arn=arn)
-    logging.info("ETL process completed.")
+    logger.info("ETL process completed.")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
     setup_infrastructure()
     main()
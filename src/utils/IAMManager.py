@@ -1,14 +1,13 @@
 import json
 import logging
-from typing import Dict
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
 import boto3
 
-from src.config import ENDPOINT_URL
+from src.config import ENDPOINT_URL, get_iam_client
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+logger = logging.getLogger(__name__)
 
 
 class IAMManager:
@@ -20,6 +19,7 @@ class IAMManager:
         aws_access_key_id: str = "dummy",
         aws_secret_access_key: str = "dummy",
         aws_region: str = "us-east-1",
+        iam_client: Optional[Any] = None,
     ):
         """
         Initialize IAM client.
@@ -28,15 +28,18 @@ class IAMManager:
             endpoint_url (str): The endpoint URL for the S3 service.
             aws_access_key_id (str): The AWS access key ID. Default is "dummy".
             aws_secret_access_key (str): The AWS secret access key. Default is "dummy".
+            iam_client (Optional[Any]): An already-built IAM client to reuse
+                instead of constructing a new one.
         """
-        self.iam_client = boto3.client(
+        self.iam_client = iam_client or boto3.client(
             "iam",
             endpoint_url=endpoint_url,
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
             region_name=aws_region,
         )
-        logging.info("iam client initialized.")
+        self._role_arn_cache: Dict[str, str] = {}
+        logger.info("iam client initialized.")
 
     def create_role(
         self, role_name: str, trust_policy: Dict, description: str = ""
@@ -55,10 +58,10 @@ class IAMManager:
                 AssumeRolePolicyDocument=json.dumps(trust_policy),
                 Description=description or f"IAM Role: {role_name}",
             )
-            logging.info(f"Role '{role_name}' created successfully.")
+            logger.info(f"Role '{role_name}' created successfully.")
             return response["Role"]["Arn"]
         except self.iam_client.exceptions.EntityAlreadyExistsException:
-            logging.info(f"Role '{role_name}' already exists.")
+            logger.info(f"Role '{role_name}' already exists.")
             return self.get_role_arn(role_name)
 
     def create_policy(
@@ -81,10 +84,10 @@ class IAMManager:
                 PolicyDocument=json.dumps(policy_document),
                 Description=description,
             )
-            logging.info(f"Policy '{policy_name}' created successfully.")
+            logger.info(f"Policy '{policy_name}' created successfully.")
             return response["Policy"]["Arn"]
         except self.iam_client.exceptions.EntityAlreadyExistsException:
-            logging.info(f"Policy '{policy_name}' already exists.")
+            logger.info(f"Policy '{policy_name}' already exists.")
             return self.get_policy_arn(policy_name)
 
     def attach_policy_to_role(self, role_name: str, policy_arn: str) -> None:
@@ -95,22 +98,29 @@ class IAMManager:
 
         """
         self.iam_client.attach_role_policy(RoleName=role_name, PolicyArn=policy_arn)
-        logging.info(f"Policy '{policy_arn}' attached to role '{role_name}'.")
+        logger.info(f"Policy '{policy_arn}' attached to role '{role_name}'.")
 
     def get_role_arn(self, role_name: str) -> str:
         """
         Retrieves the ARN of an IAM role.
+
+        Resolved ARNs are cached per instance so repeat lookups for the
+        same role skip the IAM round-trip.
         args:
             role_name: str: The name of the role.
         return:
             str: The ARN of the role
         """
+        if role_name in self._role_arn_cache:
+            return self._role_arn_cache[role_name]
         try:
             response = self.iam_client.get_role(RoleName=role_name)
         except self.iam_client.exceptions.NoSuchEntityException:
-            logging.info(f"Role '{role_name}' does not exist.")
+            logger.info(f"Role '{role_name}' does not exist.")
             return ""
-        return response["Role"]["Arn"]
+        arn = response["Role"]["Arn"]
+        self._role_arn_cache[role_name] = arn
+        return arn
 
     def get_policy_arn(self, policy_name: str) -> str:
         """
@@ -130,9 +140,9 @@ class IAMManager:
         """
         try:
             self.iam_client.delete_role(RoleName=role_name)
-            logging.info(f"Role '{role_name}' deleted successfully.")
+            logger.info(f"Role '{role_name}' deleted successfully.")
         except Exception as e:
-            logging.info(f"Error deleting role: {str(e)}")
+            logger.info(f"Error deleting role: {str(e)}")
 
     def delete_policy(self, policy_arn: str) -> None:
         """
@@ -142,6 +152,20 @@ class IAMManager:
         """
         try:
             self.iam_client.delete_policy(PolicyArn=policy_arn)
-            logging.info(f"Policy '{policy_arn}' deleted successfully.")
+            logger.info(f"Policy '{policy_arn}' deleted successfully.")
         except Exception as e:
-            logging.info(f"Error deleting policy: {str(e)}")
+            logger.info(f"Error deleting policy: {str(e)}")
+
+
+@lru_cache(maxsize=None)
+def get_iam_manager(endpoint_url: str = ENDPOINT_URL) -> IAMManager:
+    """
+    Return a cached IAMManager for the given endpoint.
+    args:
+        endpoint_url: str: The endpoint URL for the IAM service.
+    return:
+        IAMManager: The shared manager for this endpoint.
+    """
+    return IAMManager(
+        endpoint_url=endpoint_url, iam_client=get_iam_client(endpoint_url)
+    )
@@ -1,13 +1,14 @@
+import atexit
 import logging
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Iterator, Literal, Optional
 
 import boto3
-import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s",
-)
+from src.config import get_redshift_client
+
+logger = logging.getLogger(__name__)
 
 
 class RedshiftManager:
@@ -25,8 +26,14 @@ class RedshiftManager:
         aws_secret_access_key: str = "dummy",
         region_name: str = "us-east-1",
         endpoint_url: Optional[str] = "http://localhost:4566",
+        redshift_client: Optional[Any] = None,
     ):
-        """Initialize RedshiftManager with cluster and database information."""
+        """Initialize RedshiftManager with cluster and database information.
+
+        An already-built redshift client can be injected via
+        redshift_client (get_redshift_manager injects the shared cached
+        one); otherwise a new client is built from the given args.
+        """
         self.cluster_identifier = cluster_identifier
         self.database = database
         self.user = user
@@ -34,8 +41,9 @@ class RedshiftManager:
         self.host = host
         self.port = port
         self.conn = None
+        self._pool: Optional[ThreadedConnectionPool] = None
 
-        self.redshift_client = boto3.client(
+        self.redshift_client = redshift_client or boto3.client(
             "redshift",
             region_name=region_name,
             aws_access_key_id=aws_access_key_id,
@@ -43,20 +51,20 @@ class RedshiftManager:
             endpoint_url=endpoint_url,
         )
 
-        logging.info("RedshiftManager initialized.")
+        logger.info("RedshiftManager initialized.")
 
     def create_cluster_if_not_exist(self) -> None:
         """
         Create a Redshift cluster if it doesn't exist.
         """
-        logging.info(f"Checking if cluster {self.cluster_identifier} exists...")
+        logger.info(f"Checking if cluster {self.cluster_identifier} exists...")
         try:
             self.redshift_client.describe_clusters(
                 ClusterIdentifier=self.cluster_identifier
             )
-            logging.info(f"Cluster {self.cluster_identifier} already exists.")
+            logger.info(f"Cluster {self.cluster_identifier} already exists.")
         except self.redshift_client.exceptions.ClusterNotFoundFault:
-            logging.info(
+            logger.info(
                 f"Cluster {self.cluster_identifier} does not exist. Creating..."
             )
             self.redshift_client.create_cluster(
@@ -68,63 +76,123 @@ class RedshiftManager:
                 PubliclyAccessible=True,
             )
             self._wait_for_cluster_available()
-            logging.info(f"Cluster {self.cluster_identifier} created successfully.")
+            logger.info(f"Cluster {self.cluster_identifier} created successfully.")
 
     def _wait_for_cluster_available(self):
         """Wait for the Redshift cluster to be available."""
         waiter = self.redshift_client.get_waiter("cluster_available")
-        logging.info(
-            f"Waiting for cluster {self.cluster_identifier} to be available..."
-        )
+        logger.info(f"Waiting for cluster {self.cluster_identifier} to be available...")
         waiter.wait(ClusterIdentifier=self.cluster_identifier)
-        logging.info(f"Cluster {self.cluster_identifier} is available.")
+        logger.info(f"Cluster {self.cluster_identifier} is available.")
 
     def __enter__(self):
-        """Enter the runtime context related to this object."""
+        """Enter the runtime context related to this object.
+
+        Connections come from a lazily created pool, so re-entering the
+        context reuses a warm TCP/TLS session instead of paying the full
+        connect handshake again.
+        """
         try:
-            logging.info(
+            logger.info(
                 "Connecting to Redshift database: "
                 f"{self.database} on {self.host}:{self.port}"
             )
-            self.conn = psycopg2.connect(
-                dbname=self.database,
-                user=self.user,
-                password=self.password,
-                host=self.host,
-                port=self.port,
-            )
-            logging.info("Connected to Redshift successfully.")
+            if self._pool is None:
+                self._pool = ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=4,
+                    dbname=self.database,
+                    user=self.user,
+                    password=self.password,
+                    host=self.host,
+                    port=self.port,
+                    keepalives=1,
+                    keepalives_idle=30,
+                )
+            self.conn = self._pool.getconn()
+            logger.info("Connected to Redshift successfully.")
             return self
         except Exception as e:
-            logging.error(f"Failed to connect to Redshift: {e}", exc_info=True)
+            logger.error(f"Failed to connect to Redshift: {e}", exc_info=True)
             raise e
 
     def __exit__(self, exc_type, exc_value, traceback):
-        """Exit the runtime context and close the connection."""
+        """Exit the runtime context and return the connection to the pool.
+
+        On error the open transaction is rolled back first, so the pool
+        never hands out a connection stuck in an aborted transaction.
+        """
         if self.conn:
             try:
-                self.conn.close()
-                logging.info("Redshift connection closed.")
+                if exc_type is not None:
+                    self.conn.rollback()
+                self._pool.putconn(self.conn)
+                self.conn = None
+                logger.info("Redshift connection returned to the pool.")
             except Exception as e:
-                logging.error(f"Failed to close the connection: {e}", exc_info=True)
+                logger.error(f"Failed to release the connection: {e}", exc_info=True)
 
-    def execute_query(self, query: str) -> Optional[Any]:
+    def close_pool(self) -> None:
+        """Close all pooled connections, e.g. at process shutdown."""
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+            logger.info("Redshift connection pool closed.")
+
+    def execute_query(
+        self, query: str, fetch: Literal["none", "one", "all"] = "none"
+    ) -> Optional[Any]:
         """
         Execute a SQL query on Redshift.
+
+        Results are not fetched by default: DDL and COPY return no rows,
+        and fetching a large result set into memory should be an explicit
+        choice (use stream_query_results for big results).
         args:
             query: str: SQL query to execute
+            fetch: str: "none" (default), "one" or "all" rows to return
         """
         if self.conn is None:
             raise Exception("No connection to Redshift. Cannot execute query.")
         try:
             with self.conn.cursor() as cursor:
-                logging.debug(f"Executing query: {query}")
+                logger.debug(f"Executing query: {query}")
                 cursor.execute(query)
                 self.conn.commit()
-                logging.info("Query executed successfully.")
-                return cursor.fetchall() if cursor.description else None
+                logger.info("Query executed successfully.")
+                if fetch != "none" and cursor.description:
+                    return cursor.fetchone() if fetch == "one" else cursor.fetchall()
+                return None
+        except Exception as e:
+            logger.error(f"Error executing query: {e}", exc_info=True)
+            raise e
+
+    def stream_query_results(
+        self, query: str, chunk_size: int = 10_000
+    ) -> Iterator[tuple]:
+        """
+        Execute a SQL query and yield result rows in fetchmany chunks.
+
+        Keeps at most chunk_size rows in memory at a time, so large
+        result sets can be consumed without loading them all at once.
+        args:
+            query: str: SQL query to execute
+            chunk_size: int: number of rows fetched per round-trip
+        """
+        if self.conn is None:
+            raise Exception("No connection to Redshift. Cannot execute query.")
+        try:
+            with self.conn.cursor() as cursor:
+                logger.debug(f"Executing query: {query}")
+                cursor.execute(query)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield from rows
+            self.conn.commit()
         except Exception as e:
-            logging.error(f"Error executing query: {e}", exc_info=True)
+            logger.error(f"Error executing query: {e}", exc_info=True)
             raise e
 
     def copy_from_s3(
@@ -134,21 +202,59 @@ class RedshiftManager:
         iam_role: str,
         format_as: str = "CSV",
         ignore_header: int = 1,
+        gzip: bool = False,
+        manifest: bool = False,
+        statupdate: bool = False,
+        compupdate: bool = False,
     ):
         """Load data from S3 into a Redshift table using the COPY command.
+
+        Statistics and compression analysis are skipped by default: for
+        an append-only table they only add COPY time. Pass
+        statupdate/compupdate=True for an initial load that should
+        auto-analyze.
         args:
             table_name: str: name of the table to load data into
-            s3_path: str: S3 path to the data file
+            s3_path: str: S3 path to the data file, or to a manifest file
+                listing the data files when manifest is True
             format_as: str: format of the data file (default: CSV)
             ignore_header: int: number of header lines to ignore (default: 1)
+            gzip: bool: whether the S3 objects are gzip-compressed
+            manifest: bool: whether s3_path points to a COPY manifest
+            statupdate: bool: let COPY update table statistics
+            compupdate: bool: let COPY analyze column compression
         """
+        options = f"FORMAT AS {format_as} IGNOREHEADER {ignore_header}"
+        if gzip:
+            options += " GZIP"
+        if manifest:
+            options += " MANIFEST"
+        if not statupdate:
+            options += " STATUPDATE OFF"
+        if not compupdate:
+            options += " COMPUPDATE OFF"
         query = f"""
         COPY {table_name}
         FROM '{s3_path}'
         IAM_ROLE '{iam_role}'
-        FORMAT AS {format_as}
-        IGNOREHEADER {ignore_header};
+        {options};
         """
-        logging.info(f"Loading data from {s3_path} into table {table_name}.")
+        logger.info(f"Loading data from {s3_path} into table {table_name}.")
         self.execute_query(query)
-        logging.info(f"Data loaded from {s3_path} into {table_name} successfully.")
+        logger.info(f"Data loaded from {s3_path} into {table_name} successfully.")
+
+
+@lru_cache(maxsize=None)
+def get_redshift_manager() -> RedshiftManager:
+    """Return the shared RedshiftManager for the default cluster.
+
+    Call sites that build their own RedshiftManager each get their own
+    connection pool, so no connection is ever actually reused across
+    with-blocks. Sharing one manager makes the pool process-wide, and
+    its connections are closed at interpreter exit.
+    return:
+        RedshiftManager: the shared manager instance
+    """
+    manager = RedshiftManager(redshift_client=get_redshift_client())
+    atexit.register(manager.close_pool)
+    return manager